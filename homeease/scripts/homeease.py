@@ -1,17 +1,29 @@
+import array
+import atexit
 import csv
+import gzip
+import io
+import math
+import mmap
 import os
 import shutil
 import re
+import tempfile
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.prompt import Prompt, Confirm
-from rich import box
-from datetime import datetime, timedelta
 
+# Only the console is needed at import time; the table, panel, prompt and box
+# modules are imported by the functions that draw or ask something, so
+# headless callers such as backup_data() never load them.
 console = Console()
 
 # ---------------- PATH SETUP ----------------
@@ -22,6 +34,9 @@ DATA_FILE = BASE_DIR / "data" / "expenses.csv"
 LOG_FILE = BASE_DIR / "logs" / "activity.log"
 BACKUP_DIR = BASE_DIR / "backup"
 CATEGORY_FILE = BASE_DIR / "data" / "categories.csv"
+TOTAL_FILE = BASE_DIR / "data" / "total.txt"
+INDEX_FILE = BASE_DIR / "data" / "expenses.idx"
+LOCK_FILE = BASE_DIR / "data" / "expenses.lock"
 
 DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
 LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -34,55 +49,577 @@ if not CATEGORY_FILE.exists():
         for cat in ["Food", "Transport", "Travel", "Utilities", "Entertainment", "Shopping", "Medical", "Other"]:
             f.write(f"{cat}\n")
 
+# ---------------- ACTIVITY LOG HANDLE ----------------
+# Kept open for the whole session so each log entry is a buffered write
+# instead of an open/write/close round trip. The buffer is written out when
+# it fills (64 KiB), when an entry comes a second or more after the last
+# flush, by main() before it waits for the next menu input, and on exit.
+_LOG_FH = open(LOG_FILE, "a", buffering=64 * 1024)
+_LOG_FLUSH_SECS = 1.0
+_log_flushed = [0.0]
+atexit.register(_LOG_FH.close)
+
+# Categories read once per session; save_category keeps this list in step
+_CATEGORIES = None
+
 def load_categories():
-    with open(CATEGORY_FILE) as f:
-        return [line.strip() for line in f if line.strip()]
+    global _CATEGORIES
+    if _CATEGORIES is None:
+        _CATEGORIES = [line.strip() for line in CATEGORY_FILE.read_text().splitlines() if line.strip()]
+    return _CATEGORIES
 
 def save_category(new_cat):
+    load_categories().append(new_cat)
     with open(CATEGORY_FILE, "a", newline="") as f:
         f.write(f"{new_cat}\n")
 
 # ---------------- UTILITIES ----------------
+_AMT_COMMA_DEC = re.compile(r"\d+,\d+")
+_AMT_FMT = re.compile(r"\d{1,3}(,\d{3})*(\.\d+)?")
+
+class _AmountChars(dict):
+    # str.translate table that keeps decimal digits, "." and "," and drops
+    # everything else (currency symbols, spaces, letters). Characters outside
+    # the seeded ASCII set are classified on first sight and then cached.
+    def __missing__(self, code):
+        keep = self[code] = code if chr(code).isdecimal() else None
+        return keep
+
+_AMT_KEEP = _AmountChars({ord(c): c for c in "0123456789.,"})
+
+# Last formatted log timestamp, reused for every entry within the same second
+_log_stamp = [None, ""]
+
+# Philippine Time is UTC+8 all year round (no DST)
+_PHT_OFFSET = 8 * 3600
+
+def _log_timestamp():
+    # Add 8 hours to the UTC time to match Philippine Time (PHT), whatever
+    # the local timezone of the machine is
+    sec = int(time.time())
+    if _log_stamp[0] != sec:
+        _log_stamp[0] = sec
+        _log_stamp[1] = time.strftime("%Y-%m-%d %I:%M:%S %p", time.gmtime(sec + _PHT_OFFSET))
+    return _log_stamp[1]
+
+# Today's date as written to the CSV, recomputed only once local midnight passes
+_today = {"until": 0.0, "text": ""}
+
+def _today_str():
+    now = time.time()
+    if now >= _today["until"]:
+        lt = time.localtime(now)
+        # mktime normalises day + 1 past the end of the month
+        _today["until"] = time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+        _today["text"] = time.strftime("%Y-%m-%d", lt)
+    return _today["text"]
+
 def log_activity(message):
-    # Manually add 8 hours to the UTC time to match Philippine Time (PHT)
-    pht_time = datetime.now() + timedelta(hours=8)
-    timestamp = pht_time.strftime("%Y-%m-%d %I:%M:%S %p")
-    
-    with open(LOG_FILE, "a") as log:
-        log.write(f"[{timestamp}] - {message}\n")
+    _LOG_FH.write(f"[{_log_timestamp()}] - {message}\n")
+    now = time.monotonic()
+    if now - _log_flushed[0] >= _LOG_FLUSH_SECS:
+        _LOG_FH.flush()
+        _log_flushed[0] = now
 
-def validate_amount(input_amount):
-    # 1. Check for negative sign immediately
-    if input_amount.strip().startswith("-"):
-        console.print("[red]❌ Amount cannot be negative![/red]")
-        return None
+def _advise_sequential(f, mm):
+    # Every reader sweeps the file front to back, so ask for full readahead
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+
+def _iter_rows():
+    # Read the expenses CSV through a read-only memory map so repeated redraws
+    # are served straight from the page cache. mmap refuses empty files.
+    if _data_empty():
+        return
+    with open(DATA_FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        _advise_sequential(f, mm)
+        yield from csv.reader(line.decode() for line in iter(mm.readline, b""))
+
+# Append-only descriptor for expenses.csv, opened on first use so each new
+# expense is a single O_APPEND write(). Swapping the file out via
+# _atomic_write() closes it, since it would still point at the old inode.
+_data_fd = None
+
+def _append_data(data):
+    # Called under _data_lock(). Another instance may have swapped in a new
+    # expenses.csv since the descriptor was opened, and a write to the old,
+    # unlinked inode would be lost without an error, so check first.
+    global _data_fd
+    if _data_fd is not None:
+        st = os.fstat(_data_fd)
+        try:
+            current = DATA_FILE.stat()
+        except FileNotFoundError:
+            current = None
+        if current is None or (st.st_dev, st.st_ino) != (current.st_dev, current.st_ino):
+            _close_data_fd()
+    if _data_fd is None:
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        flags |= getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+        _data_fd = os.open(DATA_FILE, flags, 0o644)
+    os.write(_data_fd, data)
+
+def _close_data_fd():
+    global _data_fd
+    if _data_fd is not None:
+        os.close(_data_fd)
+        _data_fd = None
+
+atexit.register(_close_data_fd)
+
+@contextmanager
+def _data_lock(shared=False):
+    # Advisory flock held while expenses.csv is changed, so two instances
+    # (e.g. a cron backup and an interactive edit) never interleave their
+    # writes. Readers do not take it: a sidecar they rebuild is stamped with
+    # the signature of the file state they scanned, so a concurrent change
+    # only leaves it stale. The lock lives on a separate file because
+    # rewrites swap the data file's inode. No fsync: the page cache is
+    # shared between processes. POSIX only; on Windows this is a no-op.
+    if fcntl is None:
+        yield
+        return
+    with open(LOCK_FILE, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+# Process umask, so files created through mkstemp (always 0600) end up with
+# the mode open() would have given them; it can only be read by setting it
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+@contextmanager
+def _atomic_write(path):
+    # Yield a binary file for the new contents of path. It is written next to
+    # path and renamed over it only once complete, so a crash or Ctrl-C
+    # halfway through leaves the old file intact without any fsync. The temp
+    # name is unique: sidecars are rebuilt without the lock, so two
+    # instances may be writing the same path at once.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    tmp = Path(tmp)
+    try:
+        with open(fd, "wb") as f:
+            os.chmod(tmp, 0o666 & ~_UMASK)
+            yield f
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, path)
+    if path == DATA_FILE:
+        _close_data_fd()
+
+def _line_offsets(mm):
+    # Byte offset of the start of every line, plus the end of the file
+    offsets = [0]
+    pos = mm.find(b"\n")
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = mm.find(b"\n", pos + 1)
+    if offsets[-1] != len(mm):
+        offsets.append(len(mm))
+    return offsets
+
+_COPY_CHUNK = 1 << 20
+
+def _copy_range(out, mm, start, end):
+    for chunk in range(start, end, _COPY_CHUNK):
+        out.write(mm[chunk:min(chunk + _COPY_CHUNK, end)])
+
+def _splice_rows(changes):
+    # Apply {row index: replacement bytes} to DATA_FILE; b"" deletes the row.
+    # Untouched rows are streamed as raw byte ranges into the replacement
+    # file, so nothing is parsed or held in memory beyond a chunk.
+    offsets = _load_offsets()
+    with open(DATA_FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        _advise_sequential(f, mm)
+        with _atomic_write(DATA_FILE) as out:
+            pos = 0
+            for i in sorted(changes):
+                _copy_range(out, mm, pos, offsets[i])
+                out.write(changes[i])
+                pos = offsets[i + 1]
+            _copy_range(out, mm, pos, len(mm))
+
+# ---------------- ROW OFFSET INDEX ----------------
+# INDEX_FILE caches where every row of expenses.csv starts, as int64s:
+# [mtime_ns, size, offset_0, ..., offset_n, end of file]. It is rebuilt with
+# one scan whenever that signature stops matching the data file, which lets
+# edit/delete seek straight to a row instead of parsing up to it.
+def _save_offsets(offsets, signature=None):
+    # Without a signature the file's current one is used, which is only
+    # right for a writer holding _data_lock()
+    index = array.array("q", signature or _data_signature())
+    index.extend(offsets)
+    _write_sidecar(INDEX_FILE, index.tobytes())
 
-    # 2. Check for comma typo
-    if re.match(r"^\d+,\d+$", input_amount.strip()):
-        console.print("[red]❌ Use decimal point, not comma (e.g. 45.7)[/red]")
+def _load_offsets():
+    index = array.array("q")
+    try:
+        index.frombytes(INDEX_FILE.read_bytes())
+    except (FileNotFoundError, ValueError):
+        pass
+    if len(index) >= 3 and tuple(index[:2]) == _data_signature():
+        return index[2:]
+
+    # Rebuilt from exactly the bytes the signature describes: it comes from
+    # the descriptor that is scanned, and only that many bytes are mapped
+    offsets = [0]
+    signature = _data_signature()
+    if signature[1]:
+        with open(DATA_FILE, "rb") as f:
+            st = os.fstat(f.fileno())
+            signature = (st.st_mtime_ns, st.st_size)
+            if st.st_size:
+                with mmap.mmap(f.fileno(), st.st_size, access=mmap.ACCESS_READ) as mm:
+                    offsets = _line_offsets(mm)
+    _save_offsets(offsets, signature)
+    return offsets
+
+def _read_rows(indices):
+    # {index: row} for the requested 0-based indices that exist, in ascending
+    # order; each row is one seek + read, nothing in between is parsed
+    offsets = _load_offsets()
+    found = {}
+    with open(DATA_FILE, "rb") as f:
+        for i in sorted(indices):
+            if 0 <= i < len(offsets) - 1:
+                f.seek(offsets[i])
+                line = f.read(offsets[i + 1] - offsets[i])
+                found[i] = next(csv.reader([line.decode()]), [])
+    return found
+
+def _read_row(idx):
+    # Row at 0-based idx, or None if there is no such row
+    return _read_rows({idx}).get(idx)
+
+def _tail_rows(k):
+    # (index of the first row returned, rows) for the last k rows; the index
+    # gives their start offset, so only that slice of the file is read
+    offsets = _load_offsets()
+    first = max(len(offsets) - 1 - k, 0)
+    with open(DATA_FILE, "rb") as f:
+        f.seek(offsets[first])
+        data = f.read()
+    # newline="" so rows split only where _line_offsets does, not on
+    # characters like U+2028 that str.splitlines() also treats as line breaks
+    return first, csv.reader(io.StringIO(data.decode(), newline=""))
+
+def _write_row(idx, data):
+    offsets = _load_offsets()
+    start, end = offsets[idx], offsets[idx + 1]
+    if len(data) != end - start:
+        # Shifting every later row in place could be torn by a crash, so a
+        # width change goes through the atomic splice instead
+        _splice_rows({idx: data})
+        return
+    # Same width: a single overwrite of the row, and every offset stays valid
+    with open(DATA_FILE, "r+b") as f:
+        f.seek(start)
+        f.write(data)
+    _save_offsets(offsets)
+
+def _csv_escape(field):
+    # Same quoting csv.writer applies with its default (excel) dialect
+    if any(c in field for c in ',"\r\n'):
+        return '"' + field.replace('"', '""') + '"'
+    return field
+
+def _encode_row(row):
+    return (",".join(_csv_escape(field) for field in row) + "\r\n").encode()
+
+def _ends_with_newline(f):
+    # True for an empty file too, so nothing gets prepended to it
+    if f.seek(0, os.SEEK_END) == 0:
+        return True
+    f.seek(-1, os.SEEK_END)
+    return f.read(1) == b"\n"
+
+def _compress_data_file(dst):
+    # Backups are gzipped: dates, category names and amounts compress ~5-10x
+    # Written through _atomic_write so a crash mid-backup never leaves a
+    # truncated .gz for recover_data() to offer
+    with open(DATA_FILE, "rb") as src, _atomic_write(dst) as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as out:
+            shutil.copyfileobj(src, out, _COPY_CHUNK)
+        # The backup is not read again this session, so hint it out of the
+        # cache. The hint skips pages still in Python's buffer or dirty in the
+        # kernel, so flush first; Linux then starts writeback and drops the
+        # pages that are already clean.
+        if hasattr(os, "posix_fadvise"):
+            raw.flush()
+            os.posix_fadvise(raw.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+def _open_backup(path):
+    # Older backups are plain CSV, newer ones gzipped
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+# From this size on, expenses.csv is parsed with pyarrow's C reader when it is
+# installed (roughly 150k rows). Importing pyarrow costs ~0.1 s, which the csv
+# module only catches up with around here; smaller files stay on it.
+_ARROW_MIN_BYTES = 8 * 1024 * 1024
+_COLUMNS = ["date", "category", "description", "amount"]
+
+def _read_arrow_table():
+    if _data_signature()[1] < _ARROW_MIN_BYTES:
+        return None
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return None
+    try:
+        arrow = pacsv.read_csv(
+            DATA_FILE,
+            read_options=pacsv.ReadOptions(column_names=_COLUMNS),
+            parse_options=pacsv.ParseOptions(ignore_empty_lines=False),
+            convert_options=pacsv.ConvertOptions(column_types={c: pa.string() for c in _COLUMNS}),
+        )
+    except pa.ArrowInvalid:
+        arrow = None
+    # Blank or ragged rows: the csv module path numbers and skips those the
+    # same way edit/delete do, so leave them to it
+    if arrow is None or pc.any(pc.equal(arrow.column("amount"), "")).as_py():
         return None
+    return arrow
 
-    # 3. Clean the input (remove currency symbols or spaces)
-    clean = re.sub(r"[^\d.,]", "", input_amount)
-    
-    # 4. Handle thousands separators vs decimals
-    if clean.count(",") and not re.match(r"^\d{1,3}(,\d{3})*(\.\d+)?$", clean):
-        console.print("[red]❌ Invalid number format[/red]")
+# Without pyarrow, a large file's total can still be re-summed by a numba
+# kernel straight over the mapped bytes. numba (and numpy) are optional and
+# cost a comparable import, hence the same size floor.
+_JIT_MIN_BYTES = _ARROW_MIN_BYTES
+_jit_sum = None
+
+def _sum_amounts(buf):
+    # Sum the last field of every 4-field row, where amounts are plain
+    # centavo digits; blank and ragged rows add nothing, as in _row_amount
+    total = 0
+    val = 0
+    fields = 0
+    quoted = False
+    for b in buf:
+        if b == 34:  # "
+            quoted = not quoted
+        elif quoted:
+            pass
+        elif b == 44:  # ,
+            fields += 1
+            val = 0
+        elif b == 10 or b == 13:  # \n \r
+            if fields == 3:
+                total += val
+            fields = 0
+            val = 0
+        elif 48 <= b <= 57:
+            val = val * 10 + (b - 48)
+    if fields == 3:
+        total += val
+    return total
+
+def _jit_total():
+    global _jit_sum
+    if _data_signature()[1] < _JIT_MIN_BYTES:
         return None
+    if _jit_sum is None:
+        try:
+            import numba
+        except ImportError:
+            _jit_sum = False
+        else:
+            _jit_sum = numba.njit(cache=True, nogil=True)(_sum_amounts)
+    if not _jit_sum:
+        return None
+
+    import numpy as np
+    with open(DATA_FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        _advise_sequential(f, mm)
+        buf = np.frombuffer(mm, dtype=np.uint8)
+        try:
+            return int(_jit_sum(buf))
+        finally:
+            # The array must let go of the map before it can be closed
+            del buf
+
+# ---------------- AMOUNTS ----------------
+# Amounts are stored as whole centavos ("125050" for ₱1,250.50) so reading
+# them back is a plain int() and the total is an exact integer sum; the
+# thousands separators only exist on screen.
+# Largest amount the int64 sums (Arrow, numba, the sidecars) can hold
+_MAX_CENTAVOS = 2 ** 63 - 1
+
+def _to_centavos(amount):
+    return int(round(amount * 100))
+
+def _format_amount(centavos):
+    return f"{centavos // 100:,}.{centavos % 100:02d}"
+
+def _row_amount(row):
+    return int(row[3]) if len(row) == 4 else 0
+
+def _migrate_amounts():
+    # One-shot upgrade of rows written before amounts were stored in
+    # centavos ("1,250.50"); also covers rows recovered from old backups.
+    # This runs on every start, so large files are checked in Arrow first.
+    arrow = _read_arrow_table()
+    if arrow is not None:
+        import pyarrow.compute as pc
+        if pc.all(pc.utf8_is_digit(arrow.column("amount"))).as_py():
+            return
+
+    if all(len(row) != 4 or row[3].isdigit() for row in _iter_rows()):
+        return
+
+    # Streamed row by row into the replacement file
+    with _atomic_write(DATA_FILE) as f:
+        for row in _iter_rows():
+            if len(row) == 4 and not row[3].isdigit():
+                row[3] = str(_to_centavos(float(row[3].replace(",", ""))))
+            f.write(_encode_row(row))
 
+# ---------------- RUNNING TOTAL ----------------
+# TOTAL_FILE holds "<mtime_ns> <size> <total>" for the expenses.csv it was
+# computed from. Mutations adjust the stored total instead of re-summing the
+# whole CSV; if the file changed behind our back it is re-scanned once.
+def _data_signature():
     try:
-        value = float(clean.replace(",", ""))
-        # 5. Strict zero and negative check
-        if value <= 0:
-            console.print("[red]❌ Amount must be greater than zero[/red]")
+        st = DATA_FILE.stat()
+    except FileNotFoundError:
+        return (0, 0)
+    return (st.st_mtime_ns, st.st_size)
+
+def _data_empty():
+    # Missing or zero-length, from a single stat() call
+    return _data_signature()[1] == 0
+
+def _write_sidecar(path, data):
+    # Atomic, so a crash mid-write can never leave a torn sidecar that still
+    # carries a matching signature
+    with _atomic_write(path) as f:
+        f.write(data)
+
+def _write_total(total, signature=None):
+    # Same signature rule as _save_offsets
+    mtime_ns, size = signature or _data_signature()
+    _write_sidecar(TOTAL_FILE, f"{mtime_ns} {size} {total}\n".encode())
+
+def _load_total():
+    try:
+        mtime_ns, size, total = TOTAL_FILE.read_text().split()
+        if (int(mtime_ns), int(size)) == _data_signature():
+            return int(total)
+    except (FileNotFoundError, ValueError):
+        pass
+
+    # Taken before the scan: if the file changes while it is being summed,
+    # the stored total simply no longer matches and is recomputed next time
+    signature = _data_signature()
+    arrow = _read_arrow_table()
+    if arrow is not None:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        total = pc.sum(pc.cast(arrow.column("amount"), pa.int64())).as_py() or 0
+    else:
+        total = _jit_total()
+        if total is None:
+            total = sum(_row_amount(row) for row in _iter_rows())
+    _write_total(total, signature)
+    return total
+
+def _parse_amount_fast(s):
+    # One left-to-right scan for the well-formed shapes people actually type:
+    # "5000", "45.70", "1,250.50". Returns None for anything else (symbols,
+    # bad grouping, typos) so validate_amount can say exactly what is wrong.
+    whole = frac = 0
+    scale = 1
+    digits = 0
+    commas = 0
+    group = 0       # digits since the last comma, or since the start
+    dot = False
+    for ch in s:
+        d = ord(ch) - 48
+        if 0 <= d <= 9:
+            digits += 1
+            if dot:
+                frac = frac * 10 + d
+                scale *= 10
+            else:
+                whole = whole * 10 + d
+                group += 1
+        elif ch == "," and not dot:
+            # Thousands groups: 1-3 leading digits, then exactly 3 per group
+            if not (1 <= group <= 3 if commas == 0 else group == 3):
+                return None
+            commas += 1
+            group = 0
+        elif ch == "." and not dot:
+            dot = True
+        else:
             return None
-        return value
-    except ValueError:
+
+    if not digits:
+        return None
+    if commas:
+        # "1,234" is reported as a comma-for-decimal typo, "1,234." as a bad
+        # format; both are left to the full checks
+        if group != 3 or (dot and scale == 1) or (commas == 1 and not dot):
+            return None
+    # Exact integer division rounds the same way float() does on the string
+    try:
+        return (whole * scale + frac) / scale
+    except OverflowError:
+        # Hundreds of digits: float() on the string would give inf as well
+        return math.inf
+
+def validate_amount(input_amount):
+    stripped = input_amount.strip()
+
+    # 0. Fast path: well-formed amounts are parsed in a single scan
+    value = _parse_amount_fast(stripped)
+    if value is None:
+        # 1. Check for negative sign immediately
+        if stripped.startswith("-"):
+            console.print("[red]❌ Amount cannot be negative![/red]")
+            return None
+
+        # 2. Check for comma typo
+        if _AMT_COMMA_DEC.fullmatch(stripped):
+            console.print("[red]❌ Use decimal point, not comma (e.g. 45.7)[/red]")
+            return None
+
+        # 3. Clean the input (remove currency symbols or spaces)
+        clean = input_amount.translate(_AMT_KEEP)
+
+        # 4. Handle thousands separators vs decimals
+        if "," in clean and not _AMT_FMT.fullmatch(clean):
+            console.print("[red]❌ Invalid number format[/red]")
+            return None
+
+        try:
+            value = float(clean.replace(",", ""))
+        except ValueError:
+            console.print("[red]❌ Please enter a valid number[/red]")
+            return None
+
+    # 5. Must be finite and fit the int64 centavos the total is summed in
+    if not math.isfinite(value) or value * 100 > _MAX_CENTAVOS:
         console.print("[red]❌ Please enter a valid number[/red]")
         return None
 
+    # 6. Strict zero and negative check
+    if value <= 0:
+        console.print("[red]❌ Amount must be greater than zero[/red]")
+        return None
+    return value
+
 def is_valid_category(cat):
-    if not re.search(r"[A-Za-z]", cat):
+    # At least one ASCII letter; stops at the first one found
+    if not any(c.isascii() and c.isalpha() for c in cat):
         console.print("[red]Category must contain at least one letter[/red]")
         return False
     return True
@@ -90,6 +627,9 @@ def is_valid_category(cat):
 # ---------------- UI ----------------
 
 def make_header():
+    from rich import box
+    from rich.panel import Panel
+
     return Panel(
         "[bold cyan]                                         🏠 HOMEEASE EXPENSE TRACKER[/bold cyan]",
         border_style="bright_blue",
@@ -97,31 +637,85 @@ def make_header():
         expand=True
     )
 
-def display_table():
-    table = Table(box=box.ROUNDED, header_style="bold magenta", expand=True, show_lines=True)
-    table.add_column("ID", justify="center")
-    table.add_column("Date")
-    table.add_column("Category", style="cyan")
-    table.add_column("Description")
-    table.add_column("Amount", justify="right", style="bold green")
+# Rendered expenses table, reused across redraws until expenses.csv changes
+_table_cache = {"key": None, "table": None}
 
-    total = 0.0
+def display_table():
+    from rich import box
+    from rich.panel import Panel
+    from rich.table import Table
 
-    if not DATA_FILE.exists() or os.path.getsize(DATA_FILE) == 0:
+    mtime_ns, size = _data_signature()
+    if size == 0:
         return Panel("[yellow]No records yet. Add an expense![/yellow]")
 
-    with open(DATA_FILE) as f:
-        for i, row in enumerate(csv.reader(f), start=1):
-            if len(row) == 4:
-                table.add_row(str(i), row[0], row[1], row[2], f"₱{row[3]}")
-                total += float(row[3].replace(",", ""))
+    # Terminal lines left for records once the header panel (3), the table's
+    # borders, column header, TOTAL row and its rule (6) and the menu (9)
+    # are drawn
+    budget = max(console.size.height - 18, 5)
+    key = (mtime_ns, size, budget)
+    if _table_cache["key"] == key:
+        return _table_cache["table"]
+
+    # Row separators double the table's height, so they are drawn only when
+    # every record fits with them (and never past 50 records). Otherwise just
+    # the most recent records that fit are shown, one line each, leaving a
+    # line for the "older records hidden" placeholder.
+    count = len(_load_offsets()) - 1
+    show_lines = count <= 50 and 2 * count - 1 <= budget
+    first, rows = _tail_rows(budget if count <= budget else budget - 1)
+    rows = [(i, row) for i, row in enumerate(rows, start=first + 1) if len(row) == 4]
+    amounts = [f"₱{_format_amount(int(row[3]))}" for _, row in rows]
+    total = f"₱{_format_amount(_load_total())}"
+
+    # Every record stays on one line (long descriptions are cut with "…"),
+    # and the fixed-width columns get their width up front so Rich does not
+    # have to measure every cell in them.
+    table = Table(box=box.ROUNDED, header_style="bold magenta", expand=True,
+                  show_lines=show_lines)
+    table.add_column("ID", justify="center", no_wrap=True,
+                     width=max(len(str(rows[-1][0])) if rows else 0, len("ID")))
+    table.add_column("Date", no_wrap=True, width=len("YYYY-MM-DD"))
+    table.add_column("Category", style="cyan", no_wrap=True, overflow="ellipsis", max_width=20)
+    table.add_column("Description", ratio=1, no_wrap=True, overflow="ellipsis")
+    table.add_column("Amount", justify="right", style="bold green", no_wrap=True,
+                     width=max(map(len, amounts + [total, "Amount"])))
+
+    if first:
+        table.add_row("…", "", "", f"[dim]{first} older record(s) hidden[/dim]", "")
+
+    for (i, row), amount in zip(rows, amounts):
+        table.add_row(str(i), row[0], row[1], row[2], amount)
 
     table.add_section()
-    table.add_row("", "", "", "[bold]TOTAL[/bold]", f"[bold yellow]₱{total:,.2f}[/bold yellow]")
+    table.add_row("", "", "", "[bold]TOTAL[/bold]", f"[bold yellow]{total}[/bold yellow]")
+
+    _table_cache["key"] = key
+    _table_cache["table"] = table
     return table
 
+# Header + expenses table as rendered terminal output, replayed on every menu
+# redraw until the data file or the terminal size changes
+_screen_cache = {"key": None, "text": ""}
+
+def render_screen():
+    key = (_data_signature(), console.size)
+    # A same-size in-place edit can leave the signature unchanged on coarse
+    # mtime filesystems, so also honour the table cache being cleared
+    if _screen_cache["key"] != key or _table_cache["key"] is None:
+        with console.capture() as capture:
+            console.print(make_header())
+            console.print(display_table())
+        _screen_cache["key"] = key
+        _screen_cache["text"] = capture.get()
+    console.file.write(_screen_cache["text"])
+    console.file.flush()
+
 # ---------------- CATEGORY TABLE ----------------
 def display_categories_table(categories):
+    from rich import box
+    from rich.table import Table
+
     table = Table(
         title="Select Category", 
         box=box.ROUNDED, 
@@ -140,6 +734,9 @@ def display_categories_table(categories):
 # ---------------- CORE ----------------
 
 def add_expense():
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+
     console.print(Panel("[bold green]✙ ADD EXPENSE[/bold green]"))
 
     categories = load_categories()
@@ -180,27 +777,32 @@ def add_expense():
         if amount:
             break
 
-    with open(DATA_FILE, "a", newline="") as f:
-        csv.writer(f).writerow([
-            datetime.now().strftime("%Y-%m-%d"),
-            category,
-            description,
-            f"{amount:,.2f}"
-        ])
+    line = _encode_row([
+        _today_str(),
+        category,
+        description,
+        str(_to_centavos(amount))
+    ])
+    with _data_lock():
+        total = _load_total()
+        offsets = _load_offsets()
+        _append_data(line)
+        # Keep the row index current so the next redraw does not rescan the file
+        offsets.append(offsets[-1] + len(line))
+        _save_offsets(offsets)
 
+        _write_total(total + _to_centavos(amount))
+    _table_cache["key"] = None
     log_activity(f"Added expense {category} - {amount}")
     console.print("[bold green]✔ Expense added successfully![/bold green]")
 
 def edit_expense():
+    from rich.prompt import Prompt
+
     # Guard: Check if file exists and has data
-    if not DATA_FILE.exists() or os.path.getsize(DATA_FILE) == 0:
+    if _data_empty():
         console.print("[yellow]⚠ No records found to edit. Add an expense first![/yellow]")
         return
-    # Load rows from the data file
-    rows = list(csv.reader(open(DATA_FILE)))
-    if not rows:
-        return
-
     # Prompt for ID to edit
     choice_id = Prompt.ask("ID to EDIT").strip()
     if not choice_id.isdigit():
@@ -208,13 +810,15 @@ def edit_expense():
         return
         
     idx = int(choice_id) - 1
-    if not (0 <= idx < len(rows)):
+    row = _read_row(idx)
+    if row is None:
         console.print("[red]Invalid ID[/red]")
         return
+    original = list(row)
 
     # --- CATEGORY SELECTION WITH DYNAMIC DEFAULT ---
     categories = load_categories()
-    current_cat = rows[idx][1]
+    current_cat = row[1]
     
     # Determine the default number based on existing data
     try:
@@ -235,14 +839,14 @@ def edit_expense():
             
         choice = int(choice)
         if 1 <= choice <= len(categories):
-            rows[idx][1] = categories[choice-1]
+            row[1] = categories[choice-1]
             break
         elif choice == len(categories)+1:
             while True:
                 # Suggest the current category name as the default text for the new entry
                 new_cat = Prompt.ask("Enter new category name", default=current_cat).strip()
                 if is_valid_category(new_cat):
-                    rows[idx][1] = new_cat
+                    row[1] = new_cat
                     # Save to categories list if it's truly a new unique category
                     if new_cat not in categories:
                         save_category(new_cat)
@@ -253,32 +857,40 @@ def edit_expense():
             console.print("[red]Invalid choice[/red]")
 
     # Edit Description
-    rows[idx][2] = Prompt.ask("New Description", default=rows[idx][2])
+    row[2] = Prompt.ask("New Description", default=row[2])
 
     # Edit Amount
+    old_amount = _row_amount(row)
     while True:
-        amt_input = Prompt.ask("New Amount", default=rows[idx][3])
+        amt_input = Prompt.ask("New Amount", default=_format_amount(old_amount))
         amt = validate_amount(amt_input)
         if amt:
-            rows[idx][3] = f"{amt:,.2f}"
+            row[3] = str(_to_centavos(amt))
             break
 
     # Save all changes back to the CSV
-    with open(DATA_FILE, "w", newline="") as f:
-        csv.writer(f).writerows(rows)
+    with _data_lock():
+        # The prompts above ran without the lock; if another session changed
+        # or removed this record meanwhile, do not write over it
+        if _read_row(idx) != original:
+            console.print("[red]❌ This record was changed in another session; nothing was saved[/red]")
+            return
+        total = _load_total()
+        _write_row(idx, _encode_row(row))
+        _write_total(total - old_amount + int(row[3]))
 
+    _table_cache["key"] = None
     log_activity(f"Edited ID {idx+1}")
     console.print("[bold green]✔ Update successful![/bold green]")
 
 def delete_expense():
+    from rich.panel import Panel
+    from rich.prompt import Confirm, Prompt
+
     # Guard: Check if file exists and has data
-    if not DATA_FILE.exists() or os.path.getsize(DATA_FILE) == 0:
+    if _data_empty():
         console.print("[yellow]⚠ No records found to delete![/yellow]")
         return
-    rows = list(csv.reader(open(DATA_FILE)))
-    if not rows:
-        return
-
     console.print(
         Panel(
             "[bold red]DELETE OPTIONS[/bold red]\n\n"
@@ -293,26 +905,37 @@ def delete_expense():
 
     if choice == "ALL":
         if Confirm.ask("[bold red]This will delete ALL data. Continue?[/bold red]"):
-            open(DATA_FILE, "w").close()
+            with _data_lock():
+                os.truncate(DATA_FILE, 0)
+                _write_total(0)
+            _table_cache["key"] = None
             log_activity("Deleted ALL expenses")
             console.print("[bold green]✔ All data deleted[/bold green]")
         return
 
     try:
-        ids = sorted({int(i.strip()) - 1 for i in choice.split(",")})
-        valid_ids = [i for i in ids if 0 <= i < len(rows)]
+        selected = _read_rows({int(i.strip()) - 1 for i in choice.split(",")})
+        valid_ids = list(selected)
 
         if not valid_ids:
             console.print("[red]No valid IDs provided[/red]")
             return
 
         if Confirm.ask(f"[red]Delete {len(valid_ids)} selected record(s)?[/red]"):
-            for i in reversed(valid_ids):
-                rows.pop(i)
+            with _data_lock():
+                # Only delete what the user confirmed: if another session
+                # changed these rows during the prompt, the indices are stale
+                if _read_rows(valid_ids) != selected:
+                    console.print("[red]❌ Records were changed in another session; nothing was deleted[/red]")
+                    return
+                total = _load_total()
+                for row in selected.values():
+                    total -= _row_amount(row)
 
-            with open(DATA_FILE, "w", newline="") as f:
-                csv.writer(f).writerows(rows)
+                _splice_rows(dict.fromkeys(valid_ids, b""))
+                _write_total(total)
 
+            _table_cache["key"] = None
             log_activity(f"Deleted IDs: {', '.join(str(i+1) for i in valid_ids)}")
             console.print("[bold green]✔ Selected expenses deleted[/bold green]")
 
@@ -321,16 +944,37 @@ def delete_expense():
 
 def backup_data():
     # Guard: Check if file exists and has data
-    if not DATA_FILE.exists() or os.path.getsize(DATA_FILE) == 0:
+    if _data_empty():
         console.print("[red]❌ Cannot create backup: There are no records to save.[/red]")
         return
-    name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    shutil.copy(DATA_FILE, BACKUP_DIR / name)
+    name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv.gz"
+    with _data_lock(shared=True):
+        _compress_data_file(BACKUP_DIR / name)
+    _backups_cache["mtime"] = None
     log_activity("Backup created")
     console.print(f"[bold green]💾 Backup saved: {name}[/bold green]")
 
+# Sorted backup list, reused until an entry is added to or removed from the
+# backup directory (which bumps its mtime)
+_backups_cache = {"mtime": None, "names": []}
+
+def _list_backups():
+    mtime = BACKUP_DIR.stat().st_mtime_ns
+    if _backups_cache["mtime"] != mtime:
+        # Bare names from scandir; a Path is only built for the chosen backup
+        with os.scandir(BACKUP_DIR) as it:
+            _backups_cache["names"] = sorted(
+                e.name for e in it
+                if e.name.startswith("backup_") and e.name.endswith((".csv", ".csv.gz"))
+            )
+        _backups_cache["mtime"] = mtime
+    return _backups_cache["names"]
+
 def recover_data():
-    backups = sorted(BACKUP_DIR.glob("backup_*.csv"))
+    from rich.prompt import Prompt
+    from rich.table import Table
+
+    backups = _list_backups()
     if not backups:
         console.print("[red]No backups found[/red]")
         return
@@ -339,8 +983,8 @@ def recover_data():
     table.add_column("ID", justify="center")
     table.add_column("Filename")
 
-    for i, b in enumerate(backups, 1):
-        table.add_row(str(i), b.name)
+    for i, name in enumerate(backups, 1):
+        table.add_row(str(i), name)
 
     console.print(table)
     
@@ -364,23 +1008,49 @@ def recover_data():
         console.print("[blue]Recovery cancelled.[/blue]")
         return
 
-    if mode == "overwrite":
-        shutil.copy(backups[idx], DATA_FILE)
-    else:
-        with open(backups[idx], "r") as src, open(DATA_FILE, "a", newline="") as dest:
-            reader = csv.reader(src)
-            writer = csv.writer(dest)
-            writer.writerows(reader)
+    backup = BACKUP_DIR / backups[idx]
 
-    log_activity(f"Recovered from {backups[idx].name} using {mode}")
+    try:
+        with _data_lock():
+            if mode == "overwrite":
+                with _open_backup(backup) as src, _atomic_write(DATA_FILE) as dest:
+                    shutil.copyfileobj(src, dest, _COPY_CHUNK)
+            else:
+                # Decompressed in full first, so a damaged backup fails here
+                # before anything has been added to expenses.csv
+                staged = DATA_FILE.with_suffix(".recover.tmp")
+                try:
+                    with _open_backup(backup) as src, open(staged, "w+b") as tmp:
+                        shutil.copyfileobj(src, tmp, _COPY_CHUNK)
+                        tmp.seek(0)
+                        # Plain byte copy: both files are already CSV in the same format
+                        with open(DATA_FILE, "a+b") as dest:
+                            if not _ends_with_newline(dest):
+                                dest.write(b"\r\n")
+                            shutil.copyfileobj(tmp, dest, _COPY_CHUNK)
+                            if not _ends_with_newline(dest):
+                                dest.write(b"\r\n")
+                finally:
+                    staged.unlink(missing_ok=True)
+
+            _migrate_amounts()
+    except (OSError, EOFError) as e:
+        # Truncated or corrupt backup (gzip.BadGzipFile is an OSError)
+        console.print(f"[red]❌ Could not recover from {backup.name}: {e}[/red]")
+        return
+    _table_cache["key"] = None
+    log_activity(f"Recovered from {backup.name} using {mode}")
     console.print(f"[bold green]✔ Recovery successful via {mode}![/bold green]")
 # ---------------- MAIN ----------------
 
 def main():
+    from rich.prompt import Prompt
+
+    with _data_lock():
+        _migrate_amounts()
     while True:
         console.clear()
-        console.print(make_header())
-        console.print(display_table())
+        render_screen()
 
         console.print("\n[bold]Menu[/bold]")
         console.print("[1] ✙ Add")
@@ -398,9 +1068,13 @@ def main():
         elif choice == "4": backup_data()
         elif choice == "5": recover_data()
         elif choice == "6":
+            _LOG_FH.flush()
             console.print("[italic]Goodbye! 👋[/italic]")
             break
 
+        # One write per menu action, so a session closed or killed while it
+        # waits for input has nothing left in the log buffer
+        _LOG_FH.flush()
         Prompt.ask("\nPress Enter to continue")
 
 if __name__ == "__main__":